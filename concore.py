@@ -4,8 +4,22 @@ import os
 from ast import literal_eval
 import sys
 import re
-import zmq
-import numpy as np
+import types
+import struct
+import collections
+import contextlib
+import copy
+import functools
+import threading
+import msgspec
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None # no inotify (e.g. Windows): read() falls back to polling
+try:
+    import xxhash
+except ImportError:
+    xxhash = None # unchanged() falls back to the builtin hash()
 logging.basicConfig(
     level=logging.INFO,
     format='%(levelname)s - %(message)s'
@@ -19,26 +33,125 @@ if hasattr(sys, 'getwindowsversion'):
     with open("concorekill.bat","w") as fpid:
         fpid.write("taskkill /F /PID "+str(os.getpid())+"\n")
 
+# zmq and numpy are imported on first use (see __getattr__, _load_zmq and the
+# sys.modules checks below), so file-only runs don't pay for either import.
+def _load_zmq():
+    """Import zmq and bind it as the module global `zmq`."""
+    global zmq
+    import zmq
+    return zmq
+
+def __getattr__(name):
+    # PEP 562: concore.zmq / concore.np import the module on first access
+    if name == "zmq":
+        return _load_zmq()
+    if name == "np":
+        import numpy
+        globals()["np"] = numpy
+        return numpy
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # ===================================================================
 # ZeroMQ Communication Wrapper
 # ===================================================================
+# msgpack Ext type code used for numpy arrays
+_NDARRAY_EXT = 1
+
+class NDArrayRep(msgspec.Struct, gc=False, array_like=True):
+    """Wire representation of a numpy array: dtype string, shape and raw buffer."""
+    dtype: str
+    shape: tuple
+    data: bytearray # decodes to a writable buffer for np.frombuffer
+
+_ndarray_enc = msgspec.msgpack.Encoder()
+_ndarray_dec = msgspec.msgpack.Decoder(NDArrayRep)
+
+def _nphook(obj):
+    """msgspec enc_hook: numpy scalars become native types, arrays become an Ext."""
+    np = sys.modules.get("numpy")
+    if np is None: # numpy never imported, so obj can't be a numpy object
+        raise NotImplementedError(f"Objects of type {type(obj)} are not supported")
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.hasobject or obj.dtype.fields is not None:
+            return obj.tolist() # no flat buffer to ship
+        obj = np.require(obj, requirements="C") # unlike ascontiguousarray, keeps 0-d shape
+        # ship the raw bytes: datetime64/timedelta64 don't support the buffer
+        # protocol, and the dtype string already carries the real type
+        rep = NDArrayRep(obj.dtype.str, obj.shape, obj.reshape(-1).view(np.uint8).data)
+        return msgspec.msgpack.Ext(_NDARRAY_EXT, _ndarray_enc.encode(rep))
+    raise NotImplementedError(f"Objects of type {type(obj)} are not supported")
+
+def _ext_hook(code, data):
+    """msgspec ext_hook: rebuild numpy arrays encoded by _nphook."""
+    if code == _NDARRAY_EXT:
+        import numpy as np
+        rep = _ndarray_dec.decode(data)
+        return np.frombuffer(rep.data, dtype=rep.dtype).reshape(rep.shape)
+    return msgspec.msgpack.Ext(code, bytes(data))
+
+# Shared msgpack codec for ZMQ messages and binary file payloads
+_enc = msgspec.msgpack.Encoder(enc_hook=_nphook)
+_dec = msgspec.msgpack.Decoder(ext_hook=_ext_hook)
+
+# Ports opened with batch=True coalesce small messages until this many bytes are buffered
+_ZMQ_FLUSH_BYTES = 16384
+
+def _zmq_context():
+    """
+    Process-wide ZMQ context shared by all ports, so they share one set of
+    I/O threads (CONCORE_ZMQ_IO_THREADS, default 1) instead of one per port.
+    """
+    return zmq.Context.instance(io_threads=int(os.environ.get("CONCORE_ZMQ_IO_THREADS", "1")))
+
+def _retry_timeout_ms(attempt):
+    """Exponential poll timeout between send/receive attempts: 50, 100, 200 ... 2000 ms."""
+    return min(2000, 50 * 2 ** attempt)
+
 class ZeroMQPort:
-    def __init__(self, port_type, address, zmq_socket_type):
+    def __init__(self, port_type, address, zmq_socket_type, batch=False):
         """
         port_type: "bind" or "connect"
         address: ZeroMQ address (e.g., "tcp://*:5555")
-        zmq_socket_type: zmq.REQ, zmq.REP, zmq.PUB, zmq.SUB etc.
+        zmq_socket_type: zmq.REQ, zmq.REP, zmq.PUB, zmq.SUB, zmq.PUSH, zmq.PULL etc.
+        batch: queue sends on PUSH/PUB sockets until _ZMQ_FLUSH_BYTES are buffered;
+            the caller must flush() (or use tick()/flush_zmq()) to send the rest.
         """
-        self.context = zmq.Context()
+        _load_zmq()
+        self.context = _zmq_context()
         self.socket = self.context.socket(zmq_socket_type)
+        self.socket_type = zmq_socket_type
         self.port_type = port_type  # "bind" or "connect"
         self.address = address
 
+        # Pipeline sockets: the high-water mark provides backpressure
+        if zmq_socket_type in (zmq.PUSH, zmq.PULL):
+            self.socket.setsockopt(zmq.SNDHWM, 10000)
+            self.socket.setsockopt(zmq.RCVHWM, 10000)
+
         # Configure timeouts & immediate close on failure
-        self.socket.setsockopt(zmq.RCVTIMEO, 2000)   # 2 sec receive timeout
-        self.socket.setsockopt(zmq.SNDTIMEO, 2000)   # 2 sec send timeout
+        # (PUSH never blocks on a peer, so it needs no timeouts)
+        if zmq_socket_type != zmq.PUSH:
+            self.socket.setsockopt(zmq.RCVTIMEO, 2000)   # 2 sec receive timeout
+            self.socket.setsockopt(zmq.SNDTIMEO, 2000)   # 2 sec send timeout
         self.socket.setsockopt(zmq.LINGER, 0)        # Drop pending messages on close
 
+        # Outgoing coalescing buffer: opt-in, and only for one-way sockets (REQ/REP
+        # must stay in lockstep). Without batch=True every send goes out immediately.
+        self._buf = []
+        self._bufbytes = 0
+        self._flush_bytes = _ZMQ_FLUSH_BYTES if batch and zmq_socket_type in (zmq.PUSH, zmq.PUB) else 0
+        # Messages decoded from a received batch, handed out one at a time
+        self._rbuf = collections.deque()
+        self._socket_async = None
+
+        # Pollers used to wait for readiness between retries
+        self._send_poller = zmq.Poller()
+        self._send_poller.register(self.socket, zmq.POLLOUT)
+        self._recv_poller = zmq.Poller()
+        self._recv_poller.register(self.socket, zmq.POLLIN)
+
         # Bind or connect
         if self.port_type == "bind":
             self.socket.bind(address)
@@ -48,47 +161,147 @@ class ZeroMQPort:
             logging.info(f"ZMQ Port connected to {address}")
             
     def send_json_with_retry(self, message):
-        """Send JSON message with retries if timeout occurs."""
+        """
+        Send a msgpack-encoded message. On batching ports the message is queued
+        and the queue goes out as one multipart message once it is large enough.
+        """
+        payload = _enc.encode(message)
+        self._buf.append(payload)
+        self._bufbytes += len(payload)
+        if self._bufbytes >= self._flush_bytes:
+            self.flush()
+
+    def flush(self):
+        """Send all queued messages as a single multipart message."""
+        if not self._buf:
+            return
+        frames = self._buf
+        self._buf = []
+        self._bufbytes = 0
+        if self.socket_type == zmq.PUSH:
+            self._send_nowait(frames)
+        else:
+            self._send_with_retry(frames)
+
+    def _send_with_retry(self, frames):
+        """Send frames with retries if timeout occurs."""
         for attempt in range(5):
             try:
-                self.socket.send_json(message)
+                self.socket.send_multipart(frames, copy=False)
                 return
             except zmq.Again:
                 logging.warning(f"Send timeout (attempt {attempt + 1}/5)")
-                time.sleep(0.5)
+                self._send_poller.poll(_retry_timeout_ms(attempt))
         logging.error("Failed to send after retries.")
         return
 
+    def _send_nowait(self, frames):
+        """Non-blocking send for PUSH sockets, with a single fallback if the HWM is reached."""
+        try:
+            self.socket.send_multipart(frames, flags=zmq.DONTWAIT, copy=False)
+            return
+        except zmq.Again:
+            logging.warning("Send queue full, retrying once")
+            self._send_poller.poll(2000)
+        try:
+            self.socket.send_multipart(frames, flags=zmq.DONTWAIT, copy=False)
+        except zmq.Again:
+            logging.error("Failed to send, send queue still full.")
+
     def recv_json_with_retry(self):
-        """Receive JSON message with retries if timeout occurs."""
+        """Receive msgpack-encoded message with retries if timeout occurs."""
+        if self._rbuf:
+            return self._rbuf.popleft()
+        for attempt in range(5):
+            try:
+                frames = self.socket.recv_multipart(copy=False)
+                self._rbuf.extend(_dec.decode(frame.buffer) for frame in frames)
+                return self._rbuf.popleft()
+            except zmq.Again:
+                logging.warning(f"Receive timeout (attempt {attempt + 1}/5)")
+                self._recv_poller.poll(_retry_timeout_ms(attempt))
+        logging.error("Failed to receive after retries.")
+        return None
+
+    @property
+    def socket_async(self):
+        """zmq.asyncio view of the same socket, created on first use."""
+        if self._socket_async is None:
+            import zmq.asyncio
+            self._socket_async = zmq.asyncio.Socket.from_socket(self.socket)
+        return self._socket_async
+
+    async def arecv_json_with_retry(self):
+        """Async recv_json_with_retry: awaits the socket instead of blocking the event loop."""
+        if self._rbuf:
+            return self._rbuf.popleft()
         for attempt in range(5):
             try:
-                return self.socket.recv_json()
+                frames = await self.socket_async.recv_multipart(copy=False)
+                self._rbuf.extend(_dec.decode(frame.buffer) for frame in frames)
+                return self._rbuf.popleft()
             except zmq.Again:
                 logging.warning(f"Receive timeout (attempt {attempt + 1}/5)")
-                time.sleep(0.5)
         logging.error("Failed to receive after retries.")
         return None
 
 # Global ZeroMQ ports registry
 zmq_ports = {}
 
-def init_zmq_port(port_name, port_type, address, socket_type_str):
+# Port identifier -> ("zmq", None) or ("file", port number), so read()/write()
+# resolve a port with one dict lookup instead of int() + ValueError every call
+_port_kind = {}
+
+def _classify(port_identifier):
+    """Resolve a port identifier; returns (None, None) if it is neither ZMQ nor numeric."""
+    if isinstance(port_identifier, str) and port_identifier in zmq_ports:
+        return "zmq", None
+    try:
+        return "file", int(port_identifier)
+    except ValueError:
+        return None, None
+
+def _resolve_port(port_identifier):
+    kind = _port_kind.get(port_identifier)
+    if kind is None:
+        kind = _classify(port_identifier)
+        if kind[0] is not None:
+            _port_kind[port_identifier] = kind
+    return kind
+
+# Socket roles for the "pipeline" pattern
+_PIPELINE_SOCKETS = {"producer": "PUSH", "consumer": "PULL"}
+
+def init_zmq_port(port_name, port_type, address, socket_type_str, pattern=None, batch=False):
     """
     Initializes and registers a ZeroMQ port.
     port_name (str): A unique name for this ZMQ port.
     port_type (str): "bind" or "connect".
     address (str): The ZMQ address (e.g., "tcp://*:5555", "tcp://localhost:5555").
     socket_type_str (str): String representation of ZMQ socket type (e.g., "REQ", "REP", "PUB", "SUB").
+    pattern (str, optional): "pipeline" maps socket_type_str "producer"/"consumer" to PUSH/PULL.
+        Pipeline ports keep one persistent one-way connection: there is no
+        request/reply lockstep, so no ACKs or send retries are needed.
+    batch (bool, optional): coalesce small messages on PUSH/PUB ports into
+        multipart messages of about 16 KB. Queued messages are only sent when
+        the buffer fills or on flush_zmq(), tick(), a ZMQ read() or terminate_zmq().
     """
     if port_name in zmq_ports:
         logging.info(f"ZMQ Port {port_name} already initialized.")
         return # Avoid reinitialization
+    _load_zmq()
+
+    if pattern == "pipeline":
+        socket_type_str = _PIPELINE_SOCKETS.get(socket_type_str.lower(), socket_type_str)
+    elif pattern is not None:
+        logging.error(f"Error: Unknown ZMQ pattern '{pattern}'.")
+        return
     
     try:
         # Map socket type string to actual ZMQ constant (e.g., zmq.REQ, zmq.REP)
         zmq_socket_type = getattr(zmq, socket_type_str.upper())
-        zmq_ports[port_name] = ZeroMQPort(port_type, address, zmq_socket_type)
+        zmq_ports[port_name] = ZeroMQPort(port_type, address, zmq_socket_type, batch=batch)
+        _port_kind[port_name] = ("zmq", None)
         logging.info(f"Initialized ZMQ port: {port_name} ({socket_type_str}) on {address}")
     except AttributeError:
         logging.error(f"Error: Invalid ZMQ socket type string '{socket_type_str}'.")
@@ -97,40 +310,245 @@ def init_zmq_port(port_name, port_type, address, socket_type_str):
     except Exception as e:
         logging.error(f"An unexpected error occurred during ZMQ port initialization for {port_name}: {e}")
 
+def flush_zmq():
+    """Send any messages still queued on ZMQ ports (call at the end of a simulation tick)."""
+    for port in zmq_ports.values():
+        try:
+            port.flush()
+        except Exception as e:
+            logging.error(f"Error while flushing ZMQ port {port.address}: {e}")
+
 def terminate_zmq():
+    flush_zmq()
     for port in zmq_ports.values():
         try:
             port.socket.close()
-            port.context.term()
         except Exception as e:
             logging.error(f"Error while terminating ZMQ port {port.address}: {e}")
+    # All ports share one context, terminate it once after every socket is closed
+    if zmq_ports:
+        try:
+            _zmq_context().term()
+        except Exception as e:
+            logging.error(f"Error while terminating ZMQ context: {e}")
 # --- ZeroMQ Integration End ---
 
 
 # NumPy Type Conversion Helper
+_SCALAR_TYPES = frozenset((int, float, str, bool, type(None)))
+
+def _has_numpy(obj):
+    """Return True if a numpy scalar or array is nested anywhere in `obj`."""
+    np = sys.modules.get("numpy")
+    if np is None: # numpy never imported, so there can't be numpy objects
+        return False
+    np_types = (np.generic, np.ndarray)
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        t = type(item)
+        # exact type checks first, isinstance only for subclasses
+        if t in _SCALAR_TYPES:
+            continue
+        if t is list or t is tuple:
+            stack.extend(item)
+        elif t is dict:
+            stack.extend(item.values())
+        elif isinstance(item, np_types):
+            return True
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+    return False
+
+def _has_ndarray(val):
+    """True if the list `val` has an np.ndarray element."""
+    np = sys.modules.get("numpy")
+    return np is not None and any(isinstance(v, np.ndarray) for v in val)
+
+def _is_uniform_numpy_list(obj, np):
+    """True for a non-empty list whose elements all share one numpy scalar type."""
+    if type(obj) is not list or not obj or not isinstance(obj[0], np.generic):
+        return False
+    t0 = type(obj[0])
+    return all(type(x) is t0 for x in obj)
+
 def convert_numpy_to_python(obj):
-    #Recursively convert numpy types to native Python types.
+    #Convert numpy types to native Python types.
     #This is necessary because literal_eval cannot parse numpy representations
     #like np.float64(1.0), but can parse native Python types like 1.0.
-    if isinstance(obj, np.generic):
-        # Convert numpy scalar types to Python native types
-        return obj.item()
-    elif isinstance(obj, list):
-        return [convert_numpy_to_python(item) for item in obj]
-    elif isinstance(obj, tuple):
-        return tuple(convert_numpy_to_python(item) for item in obj)
-    elif isinstance(obj, dict):
-        return {key: convert_numpy_to_python(value) for key, value in obj.items()}
-    else:
+    #Only the literal file format needs this; msgpack paths use _nphook.
+    #Payloads without numpy objects are returned as is; otherwise the copy is
+    #built with an explicit work stack of (container, key) slots, no recursion.
+    if not _has_numpy(obj):
         return obj
+    np = sys.modules["numpy"]
+    root = [obj]
+    stack = collections.deque([(root, 0)])
+    tuples = [] # slots holding lists that must become tuples again
+    while stack:
+        parent, key = stack.pop()
+        item = parent[key]
+        t = type(item)
+        if t in _SCALAR_TYPES:
+            continue
+        if t is np.ndarray or _is_uniform_numpy_list(item, np):
+            new = np.asarray(item).tolist() # whole buffer converted in C
+        elif t is list or t is tuple or (t is not dict and isinstance(item, (list, tuple))):
+            new = list(item)
+            if isinstance(item, tuple):
+                tuples.append((parent, key))
+            stack.extend((new, i) for i in range(len(new)))
+        elif t is dict or isinstance(item, dict):
+            new = dict(item)
+            stack.extend((new, k) for k in new)
+        elif isinstance(item, np.ndarray): # subclasses such as np.matrix, MaskedArray
+            new = item.tolist()
+        elif isinstance(item, np.generic):
+            new = item.item()
+        else:
+            continue
+        parent[key] = new
+    # innermost tuples were recorded last, so rebuild them first
+    for parent, key in reversed(tuples):
+        parent[key] = tuple(parent[key])
+    return root[0]
+
+# ===================================================================
+# File Change Notification
+# ===================================================================
+_inotify = None
+_watch_dirs = {}    # inotify watch descriptor -> watched directory
+_file_events = {}   # file path -> threading.Event, set whenever the file is rewritten
+_watch_lock = threading.Lock()
+
+def _inotify_loop():
+    while True:
+        for event in _inotify.read():
+            directory = _watch_dirs.get(event.wd)
+            if directory is None:
+                continue
+            file_event = _file_events.get(os.path.join(directory, event.name))
+            if file_event is not None:
+                file_event.set()
+
+def _file_event(file_path):
+    """Return the change event for `file_path`, or None if inotify can't watch it."""
+    global _inotify
+    file_event = _file_events.get(file_path)
+    if file_event is not None or INotify is None:
+        return file_event
+    with _watch_lock:
+        try:
+            if _inotify is None:
+                _inotify = INotify()
+                threading.Thread(target=_inotify_loop, name="concore-inotify", daemon=True).start()
+            directory = os.path.dirname(file_path)
+            wd = _inotify.add_watch(directory, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+        except OSError as e:
+            logging.debug(f"Cannot watch {file_path}, polling instead: {e}")
+            return None
+        _watch_dirs[wd] = directory
+        file_event = _file_events[file_path] = threading.Event()
+    return file_event
+
+def _wait_for_update(file_path, timeout):
+    """Sleep until `file_path` is rewritten or `timeout` seconds have passed."""
+    file_event = _file_event(file_path)
+    if file_event is None:
+        time.sleep(timeout)
+        return
+    file_event.wait(timeout)
+    file_event.clear()
 
 # ===================================================================
 # File & Parameter Handling
 # ===================================================================
+# Binary file payloads: 4-byte big-endian length, then that many bytes of msgpack
+_FRAME_HEADER = struct.Struct(">I")
+
+def _unframe(raw):
+    """Return the msgpack body of a binary file payload, or None for a '[...]' literal."""
+    if len(raw) < _FRAME_HEADER.size or raw[:1] == b"[":
+        return None
+    (size,) = _FRAME_HEADER.unpack_from(raw)
+    if size != len(raw) - _FRAME_HEADER.size:
+        return None
+    return memoryview(raw)[_FRAME_HEADER.size:]
+
+_READ_CHUNK = 65536
+
+def _read_file(file_path):
+    """Read the whole file as bytes with os.open/os.read, no buffered text layer."""
+    # No fd caching: writers replace the file atomically, so a kept-open fd
+    # would keep reading the old inode.
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        data = os.read(fd, _READ_CHUNK)
+        if len(data) < _READ_CHUNK:
+            return data
+        chunks = [data]
+        while data:
+            data = os.read(fd, _READ_CHUNK)
+            chunks.append(data)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+def _write_atomic(file_path, data):
+    """
+    Write `data` (str or bytes) to a temp file next to `file_path`, then
+    os.replace() it into place: readers see the old or the new content, never
+    a partial file. With durable=True in concore.params the data is fsynced first.
+    """
+    # text payloads are always UTF-8, the encoding read() decodes with
+    mode, encoding = ("wb", None) if isinstance(data, bytes) else ("w", "utf-8")
+    tmp_path = file_path + ".tmp"
+    try:
+        with open(tmp_path, mode, encoding=encoding) as outfile:
+            outfile.write(data)
+            if tryparam("durable", False):
+                outfile.flush()
+                os.fsync(outfile.fileno())
+        for attempt in range(5):
+            try:
+                os.replace(tmp_path, file_path)
+                return
+            except PermissionError:
+                # Windows refuses to replace a file a reader has open
+                if not hasattr(sys, 'getwindowsversion'):
+                    raise
+                time.sleep(0.01 * 2 ** attempt)
+        # reader still holds the file: fall back to the old in-place write
+        logging.warning(f"Could not replace {file_path} atomically, writing in place")
+        with open(file_path, mode, encoding=encoding) as outfile:
+            outfile.write(data)
+    finally:
+        # no-op after a successful replace; drops the temp file on any failure
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+def _unshared(val):
+    """Copy mutable containers handed out from a cache so callers can't alter the cached value."""
+    if isinstance(val, (list, dict, set)):
+        return copy.deepcopy(val)
+    return val
+
+# filename -> (st_mtime_ns, st_size, parsed value)
+_literal_cache = {}
+
 def safe_literal_eval(filename, defaultValue):
     try:
+        # one stat() decides whether the file must be read and parsed again
+        st = os.stat(filename)
+        cached = _literal_cache.get(filename)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return _unshared(cached[2])
         with open(filename, "r") as file:
-            return literal_eval(file.read())
+            val = literal_eval(file.read())
+        _literal_cache[filename] = (st.st_mtime_ns, st.st_size, val)
+        return _unshared(val)
     except (FileNotFoundError, SyntaxError, ValueError, Exception) as e:
         # Keep print for debugging, but can be made quieter
         # print(f"Info: Error reading {filename} or file not found, using default: {e}")
@@ -142,13 +560,40 @@ iport = safe_literal_eval("concore.iport", {})
 oport = safe_literal_eval("concore.oport", {})
 
 # Global variables
-s = ''
-olds = ''
-delay = 1
-retrycount = 0
+class _State:
+    """Mutable simulation state; slotted attribute access is cheaper than global lookups."""
+    __slots__ = ('simtime', 's', 'olds', 'retrycount', 'delay', 'maxtime')
+
+_state = _State()
+_state.s = 0 # running hash of everything read since the last unchanged() reset
+_state.olds = 0
+_state.delay = 1
+_state.retrycount = 0
+_state.simtime = 0
+_state.maxtime = 100
+
+class _ConcoreModule(types.ModuleType):
+    """
+    Module type forwarding concore.simtime, concore.delay etc. to _state (read
+    and write). A star import copies the values once, like any module global.
+    """
+
+for _name in _State.__slots__:
+    setattr(_ConcoreModule, _name, property(
+        lambda self, name=_name: getattr(_state, name),
+        lambda self, value, name=_name: setattr(_state, name, value)))
+
+sys.modules[__name__].__class__ = _ConcoreModule
+# Also list the names in the module __dict__ so `from concore import *` exports
+# them. The class properties are data descriptors and take precedence over
+# these entries, so concore.<name> and the star import (which uses getattr)
+# both see the live _state value.
+for _name in _State.__slots__:
+    globals()[_name] = None
+del _name
+
 inpath = "./in" #must be rel path for local
 outpath = "./out"
-simtime = 0
 concore_params_file = os.path.join(inpath + "1", "concore.params")
 concore_maxtime_file = os.path.join(inpath + "1", "concore.maxtime")
 
@@ -156,6 +601,33 @@ concore_maxtime_file = os.path.join(inpath + "1", "concore.maxtime")
 # ===================================================================
 # Parameter Parsing
 # ===================================================================
+_CONSTANTS = {'True': True, 'False': False, 'None': None}
+_FLOAT_RE = re.compile(r'-?[0-9]+\.[0-9]*([eE][+-]?[0-9]+)?')
+# One `key = value` item of a "k1=v1;k2=v2" params string, anchored at item
+# boundaries, whitespace already trimmed
+_PARAM_RE = re.compile(r'(?:^|(?<=;))\s*([^=;]*?)\s*=\s*([^;]*?)\s*(?:;|$)')
+
+@functools.lru_cache(maxsize=512)
+def _parse_value(v):
+    #Cheap checks for the common int/float/bool values before literal_eval.
+    if v in _CONSTANTS:
+        return _CONSTANTS[v]
+    digits = v[1:] if v.startswith('-') else v
+    if digits.isdecimal() and digits.isascii() and (digits == '0' or digits[0] != '0'):
+        return int(v)
+    if _FLOAT_RE.fullmatch(v):
+        return float(v)
+    # Use literal_eval to preserve backward compatibility (integers/lists)
+    # Fallback to string for unquoted values (paths, URLs)
+    try:
+        return literal_eval(v)
+    except (ValueError, SyntaxError):
+        return v
+
+def _fast_parse(v):
+    """Parse a parameter value; results are memoized, so containers are copied."""
+    return _unshared(_parse_value(v))
+
 def parse_params(sparams: str) -> dict:
     params = {}
     if not sparams:
@@ -172,18 +644,9 @@ def parse_params(sparams: str) -> dict:
         except (ValueError, SyntaxError):
             pass
 
-    for item in s.split(";"):
-        if "=" in item:
-            key, value = item.split("=", 1)  # split only once
-            key=key.strip()
-            value=value.strip()
-            #try to convert to python type (int, float, list, etc.)
-            # Use literal_eval to preserve backward compatibility (integers/lists)
-            # Fallback to string for unquoted values (paths, URLs)
-            try:
-                params[key] = literal_eval(value)
-            except (ValueError, SyntaxError):
-                params[key] = value
+    #try to convert each value to python type (int, float, list, etc.)
+    for m in _PARAM_RE.finditer(s):
+        params[m.group(1)] = _fast_parse(m.group(2))
     return params
 
 try:
@@ -220,37 +683,48 @@ def tryparam(n, i):
 # ===================================================================
 def default_maxtime(default):
     """Read maximum simulation time from file or use default."""
-    global maxtime
-    maxtime = safe_literal_eval(concore_maxtime_file, default)
+    _state.maxtime = safe_literal_eval(concore_maxtime_file, default)
 
 default_maxtime(100)
 
+def _mix_hash(acc, data):
+    """Fold the bytes `data` into the running hash `acc` (order-sensitive)."""
+    if type(acc) is not int:
+        # scripts may still reset concore.s = '' as with the old string accumulator
+        acc = hash(acc) if acc else 0
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data, seed=acc & 0xFFFFFFFFFFFFFFFF)
+    return hash((acc, data))
+
 def unchanged():
-    """Check if global string `s` is unchanged since last call."""
-    global olds, s
-    if olds == s:
-        s = ''
+    """Check if the data read since the last call is unchanged."""
+    if _state.olds == _state.s:
+        _state.s = 0
         return True
-    olds = s
+    _state.olds = _state.s
     return False
 
 # ===================================================================
 # I/O Handling (File + ZMQ)
 # ===================================================================
-def read(port_identifier, name, initstr_val):
-    global s, simtime, retrycount
-    
-    # Default return
-    default_return_val = initstr_val
+def _default_value(initstr_val):
     if isinstance(initstr_val, str):
         try:
-            default_return_val = literal_eval(initstr_val)
+            return literal_eval(initstr_val)
         except (SyntaxError, ValueError):
             pass
+    return initstr_val
+
+def read(port_identifier, name, initstr_val):
+    # Default return
+    default_return_val = _default_value(initstr_val)
     
+    kind, file_port_num = _resolve_port(port_identifier)
+
     # Case 1: ZMQ port
-    if isinstance(port_identifier, str) and port_identifier in zmq_ports:
+    if kind == "zmq":
         zmq_p = zmq_ports[port_identifier]
+        flush_zmq() # the peer may be waiting on our queued output
         try:
             message = zmq_p.recv_json_with_retry()
             return message
@@ -262,52 +736,56 @@ def read(port_identifier, name, initstr_val):
             return default_return_val
 
     # Case 2: File-based port
-    try:
-        file_port_num = int(port_identifier)
-    except ValueError:
+    if kind is None:
         logging.error(f"Error: Invalid port identifier '{port_identifier}' for file operation. Must be integer or ZMQ name.")
         return default_return_val
 
-    time.sleep(delay) 
     file_path = os.path.join(inpath + str(file_port_num), name)
-    ins = ""
+    _wait_for_update(file_path, _state.delay)
+    raw = b""
 
     try:
-        with open(file_path, "r") as infile:
-            ins = infile.read()
+        raw = _read_file(file_path)
     except FileNotFoundError:
-        ins = str(initstr_val) 
-        s += ins  # Update s to break unchanged() loop
+        raw = str(initstr_val).encode()
+        _state.s = _mix_hash(_state.s, raw)  # Update s to break unchanged() loop
     except Exception as e:
         logging.error(f"Error reading {file_path}: {e}. Using default value.")
         return default_return_val 
 
     # Retry logic if file is empty
+    # (writes are atomic, so this only catches writers that write in place)
     attempts = 0
-    max_retries = 5 
-    while len(ins) == 0 and attempts < max_retries:
-        time.sleep(delay)
+    max_retries = 1
+    while len(raw) == 0 and attempts < max_retries:
+        _wait_for_update(file_path, _state.delay)
         try:
-            with open(file_path, "r") as infile:
-                ins = infile.read()
+            raw = _read_file(file_path)
         except Exception as e:
             logging.warning(f"Retry {attempts + 1}: Error reading {file_path} - {e}")
         attempts += 1
-        retrycount += 1
+        _state.retrycount += 1
 
-    if len(ins) == 0:
+    if len(raw) == 0:
         logging.error(f"Max retries reached for {file_path}, using default value.")
         return default_return_val
 
-    s += ins 
+    # Files written by write_file_binary hold framed msgpack, everything else is a literal
+    body = _unframe(raw)
+    ins = raw if body is None else f"<{len(body)} bytes of msgpack>"
+    _state.s = _mix_hash(_state.s, raw)
 
     # Try parsing
     try:
-        inval = literal_eval(ins)
+        if body is None:
+            ins = raw.decode("utf-8") # inside the try: bad bytes return the default
+            inval = literal_eval(ins)
+        else:
+            inval = _dec.decode(body)
         if isinstance(inval, list) and len(inval) > 0: 
             current_simtime_from_file = inval[0]
             if isinstance(current_simtime_from_file, (int, float)):
-                 simtime = max(simtime, current_simtime_from_file)
+                 _state.simtime = max(_state.simtime, current_simtime_from_file)
             return inval[1:] 
         else: 
             logging.warning(f"Warning: Unexpected data format in {file_path}: {ins}. Returning raw content or default.")
@@ -317,15 +795,58 @@ def read(port_identifier, name, initstr_val):
         return default_return_val
 
 
+async def aread(port_identifier, name, initstr_val):
+    """
+    Async variant of read(). ZMQ ports await the socket without blocking the
+    event loop, so reads on several ports overlap instead of waiting in turn:
+        x, y = await asyncio.gather(aread("p1", "x", "[0]"), aread("p2", "y", "[0]"))
+    File ports fall back to the synchronous read().
+    """
+    kind, _ = _resolve_port(port_identifier)
+    if kind != "zmq":
+        return read(port_identifier, name, initstr_val)
+    flush_zmq() # the peer may be waiting on our queued output
+    try:
+        return await zmq_ports[port_identifier].arecv_json_with_retry()
+    except zmq.error.ZMQError as e:
+        logging.error(f"ZMQ read error on port {port_identifier} (name: {name}): {e}. Returning default.")
+    except Exception as e:
+        logging.error(f"Unexpected error during ZMQ read on port {port_identifier} (name: {name}): {e}. Returning default.")
+    return _default_value(initstr_val)
+
+def read_all(*requests):
+    """
+    Synchronous helper: run aread() for each (port_identifier, name, initstr_val)
+    tuple concurrently and return the results in the same order.
+    """
+    import asyncio # only needed here; keeps it out of `import concore`
+    async def gather():
+        return await asyncio.gather(*(aread(*request) for request in requests))
+    return asyncio.run(gather())
+
+def write_file_binary(file_path, data):
+    """
+    Write `data` to `file_path` as length-prefixed msgpack.
+    numpy arrays are stored as raw buffers (see NDArrayRep) instead of
+    being flattened element by element; read() detects the format.
+    """
+    buf = _enc.encode(data)
+    _write_atomic(file_path, _FRAME_HEADER.pack(len(buf)) + buf)
+
 def write(port_identifier, name, val, delta=0):
     """
     Write data either to ZMQ port or file.
     `val` must be list (with simtime prefix) or string.
     """
-    global simtime
+    kind, file_port_num = _resolve_port(port_identifier)
 
     # Case 1: ZMQ port
-    if isinstance(port_identifier, str) and port_identifier in zmq_ports:
+    # numpy scalars are handled by the msgpack encoder, no conversion pass needed
+    if kind == "zmq":
+        batch = getattr(_tick_state, "batch", None)
+        if batch is not None:
+            batch[port_identifier][name] = val # sent when the enclosing tick() exits
+            return
         zmq_p = zmq_ports[port_identifier]
         try:
             zmq_p.send_json_with_retry(val)
@@ -333,47 +854,77 @@ def write(port_identifier, name, val, delta=0):
             logging.error(f"ZMQ write error on port {port_identifier} (name: {name}): {e}")
         except Exception as e:
             logging.error(f"Unexpected error during ZMQ write on port {port_identifier} (name: {name}): {e}")
-    
+        return
+
     # Case 2: File-based port
-    try:
-        file_port_num = int(port_identifier)
-        file_path = os.path.join(outpath + str(file_port_num), name) 
-    except ValueError:
+    if kind is None:
         logging.error(f"Error: Invalid port identifier '{port_identifier}' for file operation. Must be integer or ZMQ name.")
         return
+    file_path = os.path.join(outpath + str(file_port_num), name) 
 
     # File writing rules
     if isinstance(val, str):
-        time.sleep(2 * delay) # string writes wait longer
+        time.sleep(2 * _state.delay) # string writes wait longer
     elif not isinstance(val, list):
         logging.error(f"File write to {file_path} must have list or str value, got {type(val)}")
         return
 
     try:
-        with open(file_path, "w") as outfile:
-            if isinstance(val, list):
-                # Convert numpy types to native Python types
-                val_converted = convert_numpy_to_python(val)
-                data_to_write = [simtime + delta] + val_converted
-                outfile.write(str(data_to_write))
-                simtime += delta 
-            else: 
-                outfile.write(val)
+        if isinstance(val, list) and (tryparam("binary_io", False) or _has_ndarray(val)):
+            # binary_io=True in concore.params selects msgpack for all list writes;
+            # ndarray payloads always take it since the literal format can't hold them.
+            # numpy values are converted by _nphook while encoding, no extra pass.
+            write_file_binary(file_path, [_state.simtime + delta] + val)
+            _state.simtime += delta
+            return
+        if isinstance(val, list):
+            # Convert numpy types to native Python types
+            val_converted = convert_numpy_to_python(val)
+            data_to_write = [_state.simtime + delta] + val_converted
+            _write_atomic(file_path, str(data_to_write))
+            _state.simtime += delta 
+        else: 
+            _write_atomic(file_path, val)
     except Exception as e:
         logging.error(f"Error writing to {file_path}: {e}")
 
+_tick_state = threading.local()
+
+@contextlib.contextmanager
+def tick():
+    """
+    Batch all ZMQ writes made inside the block into one message per port.
+    On exit each port is sent {'simtime': simtime, 'items': {name: val, ...}}
+    (last write per name wins), so receivers of these ports must expect that
+    dict-of-items shape instead of a bare value. File writes stay eager.
+    Nested tick() blocks join the outermost one.
+    """
+    if getattr(_tick_state, "batch", None) is not None:
+        yield
+        return
+    _tick_state.batch = collections.defaultdict(dict)
+    try:
+        yield
+    finally:
+        batch, _tick_state.batch = _tick_state.batch, None
+        for port_identifier, items in batch.items():
+            try:
+                zmq_ports[port_identifier].send_json_with_retry({'simtime': _state.simtime, 'items': items})
+            except Exception as e:
+                logging.error(f"Error during batched ZMQ write on port {port_identifier}: {e}")
+        flush_zmq()
+
 def initval(simtime_val_str): 
     """
     Initialize simtime from string containing a list.
     Example: "[10, 'foo', 'bar']" → simtime=10, returns ['foo','bar']
     """
-    global simtime
     try:
         val = literal_eval(simtime_val_str)
         if isinstance(val, list) and len(val) > 0:
             first_element = val[0]
             if isinstance(first_element, (int, float)):
-                simtime = first_element
+                _state.simtime = first_element
                 return val[1:] 
             else:
                 logging.error(f"Error: First element in initval string '{simtime_val_str}' is not a number. Using data part as is or empty.")